@@ -1,23 +1,15 @@
 import streamlit as st
 import pandas as pd
 
-# We import our calculations and plots modules
+# We import our calculations module; plots (and matplotlib) are imported
+# lazily in the results tab
 from calculations import (
+    Inputs,
     calculate_rent_scenario,
     calculate_buy_scenario,
     calculate_rent_investment_scenario,
     compare_scenarios
 )
-from plots import (
-    plot_annual_outflow,
-    plot_investment_growth,
-    plot_net_equity_over_time,
-    plot_buy_cost_breakdown,
-    plot_rent_cost_breakdown,
-    plot_mortgage_vs_value,
-    plot_net_worth_difference,
-    plot_cumulative_outflow,
-)
 
 
 st.set_page_config(
@@ -101,47 +93,42 @@ def main():
             with col2:
                 capital_gains_tax_rate = st.slider("Capital Gains Tax Rate (%)", 0.0, 50.0, 0.0, 1.0) / 100
 
-    # Build the inputs dictionary
-    inputs = {
-        "general": {
-            "inflation_rate": inflation_rate,
-            "savings_interest_rate": savings_interest_rate,
-            "analysis_years": int(analysis_years),
-            "house_appreciation_rate": house_appreciation_rate,
-            "rent_increase_rate": rent_increase_rate
-        },
-        "rent": {
-            "current_monthly_rent": current_monthly_rent,
-            "annual_renters_insurance": annual_renters_insurance
-        },
-        "buy": {
-            "cash_price": cash_price,
-            "downpayment": downpayment,
-            "closing_costs": closing_costs,
-            "mortgage_rate": mortgage_rate,
-            "mortgage_term_years": int(mortgage_term_years),
-            
-            "property_value_tax_rate_below_9200000": property_value_tax_below_9200k,
-            "property_value_tax_rate_above_9200000": property_value_tax_above_9200k,
-            "land_tax_rate": land_tax_rate,
-            
-            "tax_authority_property_value": tax_authority_property_value,
-            "tax_authority_land_value": tax_authority_land_value,
-            "annual_revaluation_rate": annual_revaluation_rate,
-            
-            "base_insurance": base_insurance,
-            "base_maintenance": base_maintenance,
-            "base_renovations": base_renovations,
-            "community_ownership_cost": community_ownership_cost,
-            "monthly_car_lease": monthly_car_lease,
-            
-            "interest_deduction_rate": interest_deduction_rate
-        },
-        "selling": {
-            "agent_commission_rate": agent_commission_rate,
-            "capital_gains_tax_rate": capital_gains_tax_rate
-        }
-    }
+    # Build the inputs
+    inputs = Inputs(
+        inflation_rate=inflation_rate,
+        savings_interest_rate=savings_interest_rate,
+        analysis_years=int(analysis_years),
+        house_appreciation_rate=house_appreciation_rate,
+        rent_increase_rate=rent_increase_rate,
+        
+        current_monthly_rent=current_monthly_rent,
+        annual_renters_insurance=annual_renters_insurance,
+        
+        cash_price=cash_price,
+        downpayment=downpayment,
+        closing_costs=closing_costs,
+        mortgage_rate=mortgage_rate,
+        mortgage_term_years=int(mortgage_term_years),
+        
+        property_value_tax_rate_below_9200000=property_value_tax_below_9200k,
+        property_value_tax_rate_above_9200000=property_value_tax_above_9200k,
+        land_tax_rate=land_tax_rate,
+        
+        tax_authority_property_value=tax_authority_property_value,
+        tax_authority_land_value=tax_authority_land_value,
+        annual_revaluation_rate=annual_revaluation_rate,
+        
+        base_insurance=base_insurance,
+        base_maintenance=base_maintenance,
+        base_renovations=base_renovations,
+        community_ownership_cost=community_ownership_cost,
+        monthly_car_lease=monthly_car_lease,
+        
+        interest_deduction_rate=interest_deduction_rate,
+        
+        agent_commission_rate=agent_commission_rate,
+        capital_gains_tax_rate=capital_gains_tax_rate
+    )
 
     # Perform calculations
     rent_df = calculate_rent_scenario(inputs)
@@ -200,31 +187,44 @@ def main():
         st.write("**Rent + Invest Scenario**")
         st.dataframe(rent_invest_df.style.format("{:,.2f}"))
 
-        # Plots
+        # Plots (only the selected chart is built). Line charts are rendered
+        # by Altair in the browser; stacked breakdowns still use Matplotlib.
         st.subheader("Visual Comparisons")
-        fig1 = plot_annual_outflow(rent_df, buy_df)
-        st.pyplot(fig1)
-
-        fig2 = plot_investment_growth(rent_invest_df)
-        st.pyplot(fig2)
-
-        fig3 = plot_net_equity_over_time(buy_df)
-        st.pyplot(fig3)
-
-        fig4 = plot_buy_cost_breakdown(buy_df)
-        st.pyplot(fig4)
-
-        fig5 = plot_rent_cost_breakdown(rent_df)
-        st.pyplot(fig5)
-
-        fig6 = plot_mortgage_vs_value(buy_df)
-        st.pyplot(fig6)
-
-        fig7 = plot_net_worth_difference(buy_df, rent_invest_df)
-        st.pyplot(fig7)
-
-        fig8 = plot_cumulative_outflow(rent_df, buy_df)
-        st.pyplot(fig8)
+        from plots import (
+            plot_annual_outflow,
+            plot_investment_growth,
+            plot_net_equity_over_time,
+            plot_buy_cost_breakdown,
+            plot_rent_cost_breakdown,
+            plot_mortgage_vs_value,
+            plot_net_worth_difference,
+            plot_cumulative_outflow,
+        )
+
+        charts = {
+            "Annual Outflow": lambda: st.altair_chart(
+                plot_annual_outflow(rent_df, buy_df), width="stretch"
+            ),
+            "Investment Growth (Rent)": lambda: st.altair_chart(
+                plot_investment_growth(rent_invest_df), width="stretch"
+            ),
+            "Net Equity Over Time (Buy)": lambda: st.altair_chart(
+                plot_net_equity_over_time(buy_df), width="stretch"
+            ),
+            "Buy Cost Breakdown": lambda: st.pyplot(plot_buy_cost_breakdown(buy_df)),
+            "Rent Cost Breakdown": lambda: st.pyplot(plot_rent_cost_breakdown(rent_df)),
+            "Mortgage Balance vs. House Value": lambda: st.altair_chart(
+                plot_mortgage_vs_value(buy_df), width="stretch"
+            ),
+            "Net Worth Difference": lambda: st.altair_chart(
+                plot_net_worth_difference(buy_df, rent_invest_df), width="stretch"
+            ),
+            "Cumulative Outflow": lambda: st.altair_chart(
+                plot_cumulative_outflow(rent_df, buy_df), width="stretch"
+            ),
+        }
+        chart_choice = st.selectbox("Chart", list(charts))
+        charts[chart_choice]()
 
     st.write("Adjust the sliders in the input tab to explore different assumptions.")
 
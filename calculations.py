@@ -1,6 +1,53 @@
+import numpy as np
 import pandas as pd
+import streamlit as st
 
 import math
+from dataclasses import dataclass
+
+@dataclass(frozen=True, slots=True)
+class Inputs:
+    """
+    All user-supplied assumptions for the rent vs. buy comparison.
+    Frozen so it can be hashed as a cache key.
+    """
+    # General assumptions
+    inflation_rate: float
+    savings_interest_rate: float
+    analysis_years: int
+    house_appreciation_rate: float
+    rent_increase_rate: float
+    
+    # Rent scenario
+    current_monthly_rent: float
+    annual_renters_insurance: float
+    
+    # Buy scenario
+    cash_price: float
+    downpayment: float
+    closing_costs: float
+    mortgage_rate: float
+    mortgage_term_years: int
+    
+    property_value_tax_rate_below_9200000: float
+    property_value_tax_rate_above_9200000: float
+    land_tax_rate: float
+    
+    tax_authority_property_value: float
+    tax_authority_land_value: float
+    annual_revaluation_rate: float
+    
+    base_insurance: float
+    base_maintenance: float
+    base_renovations: float
+    community_ownership_cost: float
+    monthly_car_lease: float
+    
+    interest_deduction_rate: float
+    
+    # Future selling costs
+    agent_commission_rate: float
+    capital_gains_tax_rate: float
 
 def calculate_monthly_mortgage_payment(principal, annual_interest_rate, years):
     """
@@ -10,82 +57,83 @@ def calculate_monthly_mortgage_payment(principal, annual_interest_rate, years):
     num_payments = years * 12
     if monthly_rate == 0:
         return principal / num_payments
-    payment = principal * (monthly_rate / (1 - (1 + monthly_rate) ** (-num_payments)))
+    # 1 - (1 + r)^-n, computed without cancellation for small rates
+    denom = -math.expm1(-num_payments * math.log1p(monthly_rate))
+    payment = principal * monthly_rate / denom
     return payment
 
-def apply_rent_increase(initial_rent, rent_increase_rate, year):
-    """Returns monthly rent for a given year, applying annual compounding."""
-    return initial_rent * ((1 + rent_increase_rate) ** (year - 1))
-
-def apply_house_appreciation(initial_value, appreciation_rate, year):
-    """Returns house value for a given year, applying annual compounding."""
-    return initial_value * ((1 + appreciation_rate) ** (year - 1))
-
-def apply_inflation(base_cost, inflation_rate, year):
-    """Returns inflated cost for a given year, using annual compounding."""
-    return base_cost * ((1 + inflation_rate) ** (year - 1))
+def _amortize(loan, monthly_rate, num_months, payment):
+    """
+    Returns the (interest, principal, balance) arrays of a fixed-payment
+    mortgage, using the closed-form annuity balance after each payment.
+    """
+    months = np.arange(1, num_months + 1)
+    if monthly_rate == 0:
+        balance = loan - payment * months
+    else:
+        growth = (1 + monthly_rate) ** months
+        balance = loan * growth - payment * (growth - 1) / monthly_rate
+    balance = np.maximum(balance, 0)  # avoid negative
+    
+    interest = np.concatenate(([loan], balance[:-1])) * monthly_rate
+    principal = payment - interest
+    return interest, principal, balance
 
+@st.cache_data(show_spinner=False, max_entries=256)
 def calculate_rent_scenario(inputs):
     """
     Builds a year-by-year DataFrame of rent costs (including insurance).
     """
-    rent_data = []
-    years = inputs["general"]["analysis_years"]
-    rent_increase_rate = inputs["general"]["rent_increase_rate"]
-    current_monthly_rent = inputs["rent"]["current_monthly_rent"]
-    annual_renters_insurance = inputs["rent"]["annual_renters_insurance"]
-    
-    for year in range(1, years + 1):
-        monthly_rent_this_year = apply_rent_increase(
-            current_monthly_rent, 
-            rent_increase_rate, 
-            year
-        )
-        annual_rent = monthly_rent_this_year * 12
-        total_rent_cost = annual_rent + annual_renters_insurance
-        
-        rent_data.append({
-            "year": year,
-            "monthly_rent": monthly_rent_this_year,
-            "annual_rent": annual_rent,
-            "renters_insurance": annual_renters_insurance,
-            "total_rent_cost": total_rent_cost
-        })
-    
-    return pd.DataFrame(rent_data)
+    years = inputs.analysis_years
+    rent_increase_rate = inputs.rent_increase_rate
+    current_monthly_rent = inputs.current_monthly_rent
+    annual_renters_insurance = inputs.annual_renters_insurance
+    
+    years_arr = np.arange(1, years + 1)
+    monthly_rent = current_monthly_rent * (1 + rent_increase_rate) ** (years_arr - 1)
+    annual_rent = monthly_rent * 12
+    
+    return pd.DataFrame({
+        "year": years_arr,
+        "monthly_rent": monthly_rent,
+        "annual_rent": annual_rent,
+        "renters_insurance": np.full(years, annual_renters_insurance),
+        "total_rent_cost": annual_rent + annual_renters_insurance
+    })
 
+@st.cache_data(show_spinner=False, max_entries=256)
 def calculate_buy_scenario(inputs):
     """
     Builds a year-by-year DataFrame of homeownership costs and equity.
     """
-    purchase_price = inputs["buy"]["cash_price"]
-    downpayment = inputs["buy"]["downpayment"]
-    closing_costs = inputs["buy"]["closing_costs"]  # one-time upfront
-    annual_interest_rate = inputs["buy"]["mortgage_rate"]
-    mortgage_term = inputs["buy"]["mortgage_term_years"]
+    purchase_price = inputs.cash_price
+    downpayment = inputs.downpayment
+    closing_costs = inputs.closing_costs  # one-time upfront
+    annual_interest_rate = inputs.mortgage_rate
+    mortgage_term = inputs.mortgage_term_years
     
-    base_insurance = inputs["buy"]["base_insurance"]
-    base_maintenance = inputs["buy"]["base_maintenance"]
-    base_renovations = inputs["buy"]["base_renovations"]
-    community_ownership_cost = inputs["buy"]["community_ownership_cost"]
+    base_insurance = inputs.base_insurance
+    base_maintenance = inputs.base_maintenance
+    base_renovations = inputs.base_renovations
+    community_ownership_cost = inputs.community_ownership_cost
     
-    interest_deduction_rate = inputs["buy"]["interest_deduction_rate"]
-    monthly_car_lease = inputs["buy"]["monthly_car_lease"]
+    interest_deduction_rate = inputs.interest_deduction_rate
+    monthly_car_lease = inputs.monthly_car_lease
     
     # General parameters
-    analysis_years = inputs["general"]["analysis_years"]
-    inflation_rate = inputs["general"]["inflation_rate"]
-    appreciation_rate = inputs["general"]["house_appreciation_rate"]
+    analysis_years = inputs.analysis_years
+    inflation_rate = inputs.inflation_rate
+    appreciation_rate = inputs.house_appreciation_rate
     
     # Property tax rates
-    property_value_tax_rate_below_9200000 = inputs["buy"]["property_value_tax_rate_below_9200000"]
-    property_value_tax_rate_above_9200000 = inputs["buy"]["property_value_tax_rate_above_9200000"]
-    land_tax_rate = inputs["buy"]["land_tax_rate"]
+    property_value_tax_rate_below_9200000 = inputs.property_value_tax_rate_below_9200000
+    property_value_tax_rate_above_9200000 = inputs.property_value_tax_rate_above_9200000
+    land_tax_rate = inputs.land_tax_rate
     
     # Tax authority valuations
-    tax_authority_property_value = inputs["buy"]["tax_authority_property_value"]
-    tax_authority_land_value = inputs["buy"]["tax_authority_land_value"]
-    annual_revaluation_rate = inputs["buy"]["annual_revaluation_rate"]
+    tax_authority_property_value = inputs.tax_authority_property_value
+    tax_authority_land_value = inputs.tax_authority_land_value
+    annual_revaluation_rate = inputs.annual_revaluation_rate
     
     # Mortgage
     loan_amount = purchase_price - downpayment
@@ -93,163 +141,122 @@ def calculate_buy_scenario(inputs):
         loan_amount, annual_interest_rate, mortgage_term
     )
     
-    mortgage_balance = loan_amount
-    buy_data = []
+    # Yearly compounding factors, year 1 uncompounded
+    year_offsets = np.arange(analysis_years)
+    inflation_factors = (1 + inflation_rate) ** year_offsets
+    appreciation_factors = (1 + appreciation_rate) ** year_offsets
+    revaluation_factors = (1 + annual_revaluation_rate) ** year_offsets
+    
+    # House value start and end of each year
+    house_value_start = purchase_price * appreciation_factors
+    house_value_end = house_value_start * (1 + appreciation_rate)
+    
+    # Tax authority valuations, revalued every year
+    tax_authority_property_values = tax_authority_property_value * revaluation_factors
+    tax_authority_land_values = tax_authority_land_value * revaluation_factors
+    
+    # Property value tax: lower rate up to 9,200,000, higher rate above it
+    taxable_values = tax_authority_property_values * 0.8  # example logic
+    property_value_taxes = (
+        np.minimum(taxable_values, 9200000) * property_value_tax_rate_below_9200000
+        + np.maximum(taxable_values - 9200000, 0) * property_value_tax_rate_above_9200000
+    )
+    
+    # Land tax calculation
+    land_taxes = tax_authority_land_values * (1 - 0.20) * land_tax_rate
+    
+    # Apply inflation to certain costs
+    insurance = base_insurance * inflation_factors
+    maintenance = base_maintenance * inflation_factors
+    renovations = base_renovations * inflation_factors
+    community_ownership_costs = community_ownership_cost * 12 * inflation_factors
+    car_lease = monthly_car_lease * 12 * inflation_factors
     
     # Month-by-month schedule
-    monthly_records = []
     total_months = mortgage_term * 12
+    monthly_interest, monthly_principal, mortgage_balance = _amortize(
+        loan_amount, annual_interest_rate / 12, total_months, monthly_payment
+    )
+    
+    # Aggregate the schedule over each 12-month span
+    year_starts = np.arange(0, total_months, 12)
+    mortgage_years = min(mortgage_term, analysis_years)
     
-    for m in range(1, total_months + 1):
-        monthly_interest = mortgage_balance * (annual_interest_rate / 12)
-        monthly_principal = monthly_payment - monthly_interest
-        
-        mortgage_balance -= monthly_principal
-        mortgage_balance = max(mortgage_balance, 0)  # avoid negative
-        
-        monthly_records.append({
-            "month": m,
-            "interest_paid": monthly_interest,
-            "principal_paid": monthly_principal,
-            "mortgage_balance": mortgage_balance
-        })
-    
-    monthly_df = pd.DataFrame(monthly_records)
-    monthly_df["year"] = ((monthly_df["month"] - 1) // 12) + 1
-    
-    house_value_start = purchase_price
-    
-    for year in range(1, analysis_years + 1):
-        year_df = monthly_df[monthly_df["year"] == year]
-        
-        if len(year_df) == 0:
-            # Mortgage paid off before this year
-            interest_paid_this_year = 0.0
-            principal_paid_this_year = 0.0
-            mortgage_balance_end = 0.0
-        else:
-            interest_paid_this_year = year_df["interest_paid"].sum()
-            principal_paid_this_year = year_df["principal_paid"].sum()
-            mortgage_balance_end = year_df["mortgage_balance"].iloc[-1]
-        
-        # House value start and end of year
-        if year == 1:
-            house_value_start_year = house_value_start
-        else:
-            house_value_start_year = buy_data[-1]["house_value_end"]
-        
-        house_value_end_year = house_value_start_year * (1 + appreciation_rate)
-        
-        # Property value tax calculation
-        taxable_value = tax_authority_property_value * 0.8  # example logic
-        if taxable_value <= 9200000:
-            property_value_tax_this_year = taxable_value * property_value_tax_rate_below_9200000
-        else:
-            property_value_tax_this_year = (
-                9200000 * property_value_tax_rate_below_9200000
-                + (taxable_value - 9200000) * property_value_tax_rate_above_9200000
-            )
-        
-        # Land tax calculation
-        taxable_land_value = tax_authority_land_value * (1 - 0.20)
-        land_tax_this_year = taxable_land_value * land_tax_rate
-        
-        # Apply inflation to certain costs
-        insurance_this_year = apply_inflation(base_insurance, inflation_rate, year)
-        maintenance_this_year = apply_inflation(base_maintenance, inflation_rate, year)
-        renovations_this_year = apply_inflation(base_renovations, inflation_rate, year)
-        community_ownership_cost_this_year = apply_inflation(
-            community_ownership_cost * 12, inflation_rate, year
-        )
-        car_lease_this_year = apply_inflation(monthly_car_lease * 12, inflation_rate, year)
-        
-        # Interest deduction
-        net_interest_paid_this_year = interest_paid_this_year * (1 - interest_deduction_rate)
-        
-        total_annual_outflow = (
-            net_interest_paid_this_year
-            + principal_paid_this_year
-            + property_value_tax_this_year
-            + land_tax_this_year
-            + insurance_this_year
-            + maintenance_this_year
-            + renovations_this_year
-            + community_ownership_cost_this_year
-            + car_lease_this_year
-        )
-        
-        net_equity_end = house_value_end_year - mortgage_balance_end
-        
-        buy_data.append({
-            "year": year,
-            "interest_paid": net_interest_paid_this_year,
-            "principal_paid": principal_paid_this_year,
-            "property_value_tax": property_value_tax_this_year,
-            "land_tax": land_tax_this_year,
-            "insurance": insurance_this_year,
-            "maintenance": maintenance_this_year,
-            "renovations": renovations_this_year,
-            "community_ownership_cost": community_ownership_cost_this_year,
-            "car_lease": car_lease_this_year,
-            "total_outflow": total_annual_outflow,
-            "mortgage_balance_end": mortgage_balance_end,
-            "house_value_start": house_value_start_year,
-            "house_value_end": house_value_end_year,
-            "net_equity_end": net_equity_end
-        })
-        
-        # Revalue the property for next year
-        tax_authority_property_value *= (1 + annual_revaluation_rate)
-        tax_authority_land_value *= (1 + annual_revaluation_rate)
-    
-    return pd.DataFrame(buy_data)
+    # Zero once the mortgage is paid off
+    interest_paid = np.zeros(analysis_years)
+    principal_paid = np.zeros(analysis_years)
+    mortgage_balance_end = np.zeros(analysis_years)
+    interest_paid[:mortgage_years] = np.add.reduceat(monthly_interest, year_starts)[:mortgage_years]
+    principal_paid[:mortgage_years] = np.add.reduceat(monthly_principal, year_starts)[:mortgage_years]
+    mortgage_balance_end[:mortgage_years] = mortgage_balance[year_starts[:mortgage_years] + 11]
+    
+    # Interest deduction
+    net_interest_paid = interest_paid * (1 - interest_deduction_rate)
+    
+    total_annual_outflow = (
+        net_interest_paid
+        + principal_paid
+        + property_value_taxes
+        + land_taxes
+        + insurance
+        + maintenance
+        + renovations
+        + community_ownership_costs
+        + car_lease
+    )
+    
+    return pd.DataFrame({
+        "year": np.arange(1, analysis_years + 1),
+        "interest_paid": net_interest_paid,
+        "principal_paid": principal_paid,
+        "property_value_tax": property_value_taxes,
+        "land_tax": land_taxes,
+        "insurance": insurance,
+        "maintenance": maintenance,
+        "renovations": renovations,
+        "community_ownership_cost": community_ownership_costs,
+        "car_lease": car_lease,
+        "total_outflow": total_annual_outflow,
+        "mortgage_balance_end": mortgage_balance_end,
+        "house_value_start": house_value_start,
+        "house_value_end": house_value_end,
+        "net_equity_end": house_value_end - mortgage_balance_end
+    })
 
 def calculate_rent_investment_scenario(inputs, rent_df, buy_df):
     """
     Simulates investing the downpayment + closing costs plus 
     any annual cost difference (if renting is cheaper).
     """
-    merged = pd.DataFrame({
-        "year": rent_df["year"],
-        "rent_outflow": rent_df["total_rent_cost"],
-        "buy_outflow": buy_df["total_outflow"]
-    })
+    rent_outflow = rent_df["total_rent_cost"].to_numpy()
+    buy_outflow = buy_df["total_outflow"].to_numpy()
+    
+    initial_investment = inputs.downpayment + inputs.closing_costs
+    savings_rate = inputs.savings_interest_rate
+    analysis_years = inputs.analysis_years
     
-    initial_investment = inputs["buy"]["downpayment"] + inputs["buy"]["closing_costs"]
-    savings_rate = inputs["general"]["savings_interest_rate"]
-    analysis_years = inputs["general"]["analysis_years"]
+    # difference = how much cheaper (or more expensive) renting is vs buying
+    difference = buy_outflow - rent_outflow
     
-    rent_invest_data = []
+    investment_start = np.empty(analysis_years)
+    investment_end = np.empty(analysis_years)
     investment_balance = initial_investment
     
-    for year in range(1, analysis_years + 1):
-        row = merged[merged["year"] == year].iloc[0]
-        
-        rent_cost = row["rent_outflow"]
-        buy_cost = row["buy_outflow"]
-        
-        # difference = how much cheaper (or more expensive) renting is vs buying
-        difference = buy_cost - rent_cost
-        
-        investment_start = investment_balance
-        investment_after_diff = investment_start + difference
-        
+    for i in range(analysis_years):
+        investment_start[i] = investment_balance
         # Apply annual interest
-        investment_end = investment_after_diff * (1 + savings_rate)
-        
-        investment_balance = investment_end
-        
-        rent_invest_data.append({
-            "year": year,
-            "rent_outflow": rent_cost,
-            "buy_outflow": buy_cost,
-            "difference": difference,
-            "investment_start": investment_start,
-            "investment_end": investment_end
-        })
-    
-    df_rent_invest = pd.DataFrame(rent_invest_data)
-    df_rent_invest["final_rent_net_worth"] = df_rent_invest["investment_end"].iloc[-1]
+        investment_balance = (investment_balance + difference[i]) * (1 + savings_rate)
+        investment_end[i] = investment_balance
+    
+    df_rent_invest = pd.DataFrame({
+        "year": rent_df["year"].to_numpy(),
+        "rent_outflow": rent_outflow,
+        "buy_outflow": buy_outflow,
+        "difference": difference,
+        "investment_start": investment_start,
+        "investment_end": investment_end
+    })
+    df_rent_invest["final_rent_net_worth"] = investment_end[-1]
     return df_rent_invest
 
 def compare_scenarios(rent_df, buy_df, rent_invest_df, inputs):
@@ -263,7 +270,7 @@ def compare_scenarios(rent_df, buy_df, rent_invest_df, inputs):
     total_buy_outflow = buy_df["total_outflow"].sum()
     
     # Final net equity for buying
-    last_year = inputs["general"]["analysis_years"]
+    last_year = inputs.analysis_years
     final_buy_row = buy_df[buy_df["year"] == last_year].iloc[0]
     final_home_value = final_buy_row["house_value_end"]
     final_mortgage_balance = final_buy_row["mortgage_balance_end"]
@@ -271,11 +278,11 @@ def compare_scenarios(rent_df, buy_df, rent_invest_df, inputs):
     raw_equity = final_home_value - final_mortgage_balance
     
     # Selling costs
-    commission_rate = inputs["selling"]["agent_commission_rate"]
-    capital_gains_rate = inputs["selling"]["capital_gains_tax_rate"]
+    commission_rate = inputs.agent_commission_rate
+    capital_gains_rate = inputs.capital_gains_tax_rate
     
     agent_commission = final_home_value * commission_rate
-    purchase_price = inputs["buy"]["cash_price"]
+    purchase_price = inputs.cash_price
     capital_gains = max(final_home_value - purchase_price, 0)
     cgt = capital_gains * capital_gains_rate
     
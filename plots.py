@@ -1,57 +1,104 @@
-import matplotlib.pyplot as plt
+import altair as alt
+import numpy as np
 import pandas as pd
+import streamlit as st
+
+def _new_figure(figsize):
+    """
+    Returns a (fig, ax) pair on a standalone Figure, outside the pyplot
+    registry so nothing has to close it.
+    """
+    from matplotlib.figure import Figure  # deferred: only the stacked breakdowns need it
+    fig = Figure(figsize=figsize)
+    return fig, fig.subplots()
+
+def _stacked_bars(ax, years, components, labels, colors=None):
+    """
+    Draws one stacked bar per year from a (years x components) array.
+    """
+    from matplotlib.ticker import MaxNLocator
+
+    bottoms = np.cumsum(components, axis=1) - components
+    for i, label in enumerate(labels):
+        color = colors[i] if colors else None
+        ax.bar(years, components[:, i], bottom=bottoms[:, i], label=label, color=color)
+    if len(years) == 1:
+        ax.set_xticks(years)
+    else:
+        ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+
+def _line_chart(data, title, y_title, colors=None, zero_rule=False):
+    """
+    Altair line chart (with point markers) of year-indexed wide data,
+    one line per column.
+    """
+    long_data = data.reset_index().melt("Year", var_name="Series", value_name="Value")
+    scale = alt.Scale(domain=list(data.columns))
+    if colors:
+        scale = alt.Scale(domain=list(data.columns), range=colors)
+    chart = alt.Chart(long_data).mark_line(point=True).encode(
+        x=alt.X("Year:Q", title="Year", axis=alt.Axis(format="d")),
+        y=alt.Y("Value:Q", title=y_title),
+        color=alt.Color("Series:N", title=None, scale=scale, legend=alt.Legend(orient="bottom")),
+        tooltip=["Year:Q", "Series:N", alt.Tooltip("Value:Q", format=",.0f")]
+    )
+    if zero_rule:
+        rule = alt.Chart(pd.DataFrame({"Value": [0]})).mark_rule(
+            color="black", strokeDash=[4, 4]
+        ).encode(y="Value:Q")
+        chart = chart + rule
+    return chart.properties(title=title)
 
 def plot_annual_outflow(rent_df, buy_df):
-    fig, ax = plt.subplots(figsize=(8, 4))
-    ax.plot(rent_df["year"], rent_df["total_rent_cost"], label="Rent Annual Outflow", marker='o')
-    ax.plot(buy_df["year"], buy_df["total_outflow"], label="Buy Annual Outflow", marker='o')
-    ax.set_xlabel("Year")
-    ax.set_ylabel("Cost (DKK)")
-    ax.set_title("Annual Outflow: Renting vs. Buying")
-    ax.legend()
-    ax.grid(True)
-    return fig
+    """
+    Annual outflow: renting vs. buying.
+    """
+    data = pd.DataFrame({
+        "Rent Annual Outflow": rent_df["total_rent_cost"].to_numpy(),
+        "Buy Annual Outflow": buy_df["total_outflow"].to_numpy()
+    }, index=pd.Index(rent_df["year"], name="Year"))
+    return _line_chart(data, "Annual Outflow: Renting vs. Buying", "Cost (DKK)")
 
 def plot_investment_growth(rent_invest_df):
-    fig, ax = plt.subplots(figsize=(8, 4))
-    ax.plot(rent_invest_df["year"], rent_invest_df["investment_end"], 
-            label="Rent Investment Balance", marker='o', color='orange')
-    ax.set_xlabel("Year")
-    ax.set_ylabel("DKK")
-    ax.set_title("Investment Growth When Renting")
-    ax.legend()
-    ax.grid(True)
-    return fig
+    """
+    Investment balance over time in the rent scenario.
+    """
+    data = pd.DataFrame({
+        "Rent Investment Balance": rent_invest_df["investment_end"].to_numpy()
+    }, index=pd.Index(rent_invest_df["year"], name="Year"))
+    return _line_chart(data, "Investment Growth When Renting", "DKK", colors=["orange"])
 
 def plot_net_equity_over_time(buy_df):
-    fig, ax = plt.subplots(figsize=(8, 4))
-    ax.plot(buy_df["year"], buy_df["net_equity_end"], label="Home Equity (Buy)", marker='o', color='green')
-    ax.set_xlabel("Year")
-    ax.set_ylabel("DKK")
-    ax.set_title("Net Equity Over Time (Buying)")
-    ax.legend()
-    ax.grid(True)
-    return fig
+    """
+    Net home equity over time in the buy scenario.
+    """
+    data = pd.DataFrame({
+        "Home Equity (Buy)": buy_df["net_equity_end"].to_numpy()
+    }, index=pd.Index(buy_df["year"], name="Year"))
+    return _line_chart(data, "Net Equity Over Time (Buying)", "DKK", colors=["green"])
 
+@st.cache_data(show_spinner=False, max_entries=256)
 def plot_buy_cost_breakdown(buy_df):
     """
     Stacked bar chart for various cost components in the buy scenario.
     """
-    cost_components_buy = pd.DataFrame({
-        'year': buy_df['year'],
-        'Principal': buy_df['principal_paid'],
-        'Interest': buy_df['interest_paid'],
-        'Property Tax': buy_df['property_value_tax'],
-        'Land Tax': buy_df['land_tax'],
-        'Insurance': buy_df['insurance'],
-        'Maintenance': buy_df['maintenance'],
-        'Renovations': buy_df['renovations'],
-        'Community Ownership Cost': buy_df['community_ownership_cost'],
-    })
-    cost_components_buy.set_index('year', inplace=True)
+    labels = [
+        'Principal', 'Interest', 'Property Tax', 'Land Tax',
+        'Insurance', 'Maintenance', 'Renovations', 'Community Ownership Cost',
+    ]
+    cost_components_buy = np.column_stack([
+        buy_df['principal_paid'].to_numpy(),
+        buy_df['interest_paid'].to_numpy(),
+        buy_df['property_value_tax'].to_numpy(),
+        buy_df['land_tax'].to_numpy(),
+        buy_df['insurance'].to_numpy(),
+        buy_df['maintenance'].to_numpy(),
+        buy_df['renovations'].to_numpy(),
+        buy_df['community_ownership_cost'].to_numpy(),
+    ])
 
-    fig, ax = plt.subplots(figsize=(10, 6))
-    cost_components_buy.plot(kind='bar', stacked=True, ax=ax)
+    fig, ax = _new_figure(figsize=(10, 6))
+    _stacked_bars(ax, buy_df['year'].to_numpy(), cost_components_buy, labels)
     ax.set_title("Buy Scenario: Yearly Cost Breakdown (Stacked)")
     ax.set_xlabel("Year")
     ax.set_ylabel("Cost (DKK)")
@@ -59,19 +106,19 @@ def plot_buy_cost_breakdown(buy_df):
     ax.grid(True)
     return fig
 
+@st.cache_data(show_spinner=False, max_entries=256)
 def plot_rent_cost_breakdown(rent_df):
     """
     Stacked bar chart for rent scenario costs.
     """
-    cost_components_rent = pd.DataFrame({
-        'year': rent_df['year'],
-        'Rent': rent_df['annual_rent'],
-        'Renter Insurance': rent_df['renters_insurance']
-    })
-    cost_components_rent.set_index('year', inplace=True)
+    cost_components_rent = np.column_stack([
+        rent_df['annual_rent'].to_numpy(),
+        rent_df['renters_insurance'].to_numpy(),
+    ])
 
-    fig, ax = plt.subplots(figsize=(10, 6))
-    cost_components_rent.plot(kind='bar', stacked=True, color=['#1f77b4', '#ff7f0e'], ax=ax)
+    fig, ax = _new_figure(figsize=(10, 6))
+    _stacked_bars(ax, rent_df['year'].to_numpy(), cost_components_rent,
+                  ['Rent', 'Renter Insurance'], colors=['#1f77b4', '#ff7f0e'])
     ax.set_title("Rent Scenario: Yearly Cost Breakdown (Stacked)")
     ax.set_xlabel("Year")
     ax.set_ylabel("Cost (DKK)")
@@ -83,53 +130,30 @@ def plot_mortgage_vs_value(buy_df):
     """
     Mortgage balance vs. house value over time.
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.plot(buy_df["year"], buy_df["mortgage_balance_end"], label="Mortgage Balance", marker='o', color='red')
-    ax.plot(buy_df["year"], buy_df["house_value_end"], label="House Value", marker='o', color='green')
-    ax.set_title("Mortgage Balance vs. House Value Over Time (Buy)")
-    ax.set_xlabel("Year")
-    ax.set_ylabel("DKK")
-    ax.grid(True)
-    ax.legend()
-    return fig
+    data = pd.DataFrame({
+        "Mortgage Balance": buy_df["mortgage_balance_end"].to_numpy(),
+        "House Value": buy_df["house_value_end"].to_numpy()
+    }, index=pd.Index(buy_df["year"], name="Year"))
+    return _line_chart(data, "Mortgage Balance vs. House Value Over Time (Buy)", "DKK",
+                       colors=["red", "green"])
 
 def plot_net_worth_difference(buy_df, rent_invest_df):
     """
     Difference in net worth each year = buy_net_equity - rent_invest_balance.
     """
-    diff_df = pd.DataFrame({
-        'year': buy_df['year'],
-        'net_equity_buy': buy_df['net_equity_end'],
-        'net_worth_rent': rent_invest_df['investment_end']
-    })
-    diff_df['difference'] = diff_df['net_equity_buy'] - diff_df['net_worth_rent']
-
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.plot(diff_df["year"], diff_df["difference"], marker='o', color='purple', 
-            label="Net Worth Difference (Buy - Rent)")
-    ax.set_title("Difference in Net Worth Over Time")
-    ax.set_xlabel("Year")
-    ax.set_ylabel("DKK")
-    ax.grid(True)
-    ax.axhline(y=0, color='black', linestyle='--')
-    ax.legend()
-    return fig
+    difference = buy_df["net_equity_end"].to_numpy() - rent_invest_df["investment_end"].to_numpy()
+    data = pd.DataFrame({
+        "Net Worth Difference (Buy - Rent)": difference
+    }, index=pd.Index(buy_df["year"], name="Year"))
+    return _line_chart(data, "Difference in Net Worth Over Time", "DKK",
+                       colors=["purple"], zero_rule=True)
 
 def plot_cumulative_outflow(rent_df, buy_df):
     """
     Cumulative outflow comparison between rent and buy.
     """
-    rent_df['cumulative_rent_outflow'] = rent_df['total_rent_cost'].cumsum()
-    buy_df['cumulative_buy_outflow'] = buy_df['total_outflow'].cumsum()
-
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.plot(rent_df["year"], rent_df["cumulative_rent_outflow"], 
-            label="Cumulative Rent Outflow", marker='o')
-    ax.plot(buy_df["year"], buy_df["cumulative_buy_outflow"], 
-            label="Cumulative Buy Outflow", marker='o')
-    ax.set_title("Cumulative Outflow: Renting vs. Buying")
-    ax.set_xlabel("Year")
-    ax.set_ylabel("Total Outflow (DKK)")
-    ax.grid(True)
-    ax.legend()
-    return fig
+    data = pd.DataFrame({
+        "Cumulative Rent Outflow": rent_df["total_rent_cost"].cumsum().to_numpy(),
+        "Cumulative Buy Outflow": buy_df["total_outflow"].cumsum().to_numpy()
+    }, index=pd.Index(rent_df["year"], name="Year"))
+    return _line_chart(data, "Cumulative Outflow: Renting vs. Buying", "Total Outflow (DKK)")